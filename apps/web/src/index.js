@@ -93,6 +93,7 @@ const renderBubble = (text, who='assistant') => {
   div.textContent = text;
   buddyMessages.appendChild(div);
   buddyMessages.scrollTop = buddyMessages.scrollHeight;
+  return div;
 };
 if (buddySend) {
   buddySend.addEventListener('click', async () => {
@@ -103,10 +104,20 @@ if (buddySend) {
     try {
       const res = await fetch(`${apiBase}/chat`, {
         method: 'POST', headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ messages: [{ role: 'user', content: q }] })
+        body: JSON.stringify({ messages: [{ role: 'user', content: q }], stream: true })
       });
-      const data = await res.json();
-      renderBubble(data.reply || 'No reply');
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      // The reply streams in as plain text; grow the bubble as chunks arrive
+      const bubble = renderBubble('');
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        bubble.textContent += decoder.decode(value, { stream: true });
+        buddyMessages.scrollTop = buddyMessages.scrollHeight;
+      }
+      if (!bubble.textContent) bubble.textContent = 'No reply';
     } catch (e) {
       renderBubble(`Chat failed: ${e.message}`);
     }
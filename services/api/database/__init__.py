@@ -1,6 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
 from pathlib import Path
 
@@ -8,15 +10,48 @@ from pathlib import Path
 DATABASE_DIR = Path(__file__).parent.parent.parent.parent / "data"
 DATABASE_DIR.mkdir(exist_ok=True)
 DATABASE_URL = f"sqlite:///{DATABASE_DIR}/astrobio_explorer.db"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_DIR}/astrobio_explorer.db"
 
 # Create engine
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+    connect_args={"check_same_thread": False},  # Needed for SQLite
+    pool_size=5,
+    max_overflow=10
 )
 
-# Create session factory
+# Async engine for request handlers that run on the event loop. aiosqlite
+# defaults to NullPool (a new connection, and cold page cache, per
+# session), so pool connections explicitly like the sync engine does
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=5,
+    max_overflow=10
+)
+
+# Per-connection SQLite tuning: WAL lets readers run during ingestion and,
+# with synchronous=NORMAL, only fsyncs at checkpoints instead of every commit
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "mmap_size=268435456",  # 256 MiB
+    "cache_size=-65536",  # 64 MiB
+    "temp_store=MEMORY",
+    "foreign_keys=ON",
+)
+
+@event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
 
 # Create base class for models
 Base = declarative_base()
@@ -29,10 +64,173 @@ def get_database():
     finally:
         db.close()
 
+async def get_async_database():
+    """Dependency to get an async database session.
+    
+    Existing sync service code runs on it via ``await db.run_sync(fn)``,
+    where fn receives a regular Session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Full-text search over publications (SQLite FTS5, external content table).
+# The triggers keep the index in sync with every insert/update/delete on
+# publications, so writers never have to touch it directly.
+FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS publications_fts USING fts5(
+        title, abstract,
+        content='publications', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS publications_fts_ai AFTER INSERT ON publications BEGIN
+        INSERT INTO publications_fts(rowid, title, abstract)
+        VALUES (new.id, new.title, new.abstract);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS publications_fts_ad AFTER DELETE ON publications BEGIN
+        INSERT INTO publications_fts(publications_fts, rowid, title, abstract)
+        VALUES ('delete', old.id, old.title, old.abstract);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS publications_fts_au AFTER UPDATE OF title, abstract ON publications BEGIN
+        INSERT INTO publications_fts(publications_fts, rowid, title, abstract)
+        VALUES ('delete', old.id, old.title, old.abstract);
+        INSERT INTO publications_fts(rowid, title, abstract)
+        VALUES (new.id, new.title, new.abstract);
+    END
+    """,
+]
+
+# Keeps updated_at current on every UPDATE unless the statement sets it itself
+UPDATED_AT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS {table}_updated_at AFTER UPDATE ON {table}
+    FOR EACH ROW WHEN new.updated_at IS old.updated_at BEGIN
+        UPDATE {table} SET updated_at = CURRENT_TIMESTAMP WHERE id = new.id;
+    END
+"""
+
+# Timestamps come from column DEFAULTs, which SQLite cannot add to tables
+# created before they were declared; this fills them in on such databases
+TIMESTAMPS_DEFAULT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS {table}_timestamps_default AFTER INSERT ON {table}
+    FOR EACH ROW WHEN {condition} BEGIN
+        UPDATE {table} SET {assignments} WHERE rowid = new.rowid;
+    END
+"""
+
+def create_updated_at_triggers():
+    """Create updated_at triggers, and NULL timestamp defaults, for every table that has the columns"""
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if 'updated_at' in table.c:
+                conn.execute(text(UPDATED_AT_TRIGGER.format(table=table.name)))
+            columns = [c for c in ('created_at', 'updated_at') if c in table.c]
+            if not columns:
+                continue
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"
+            ), {'name': f'{table.name}_timestamps_default'}).first()
+            assignments = ', '.join(f'{c} = COALESCE({c}, CURRENT_TIMESTAMP)' for c in columns)
+            conn.execute(text(TIMESTAMPS_DEFAULT_TRIGGER.format(
+                table=table.name,
+                condition=' OR '.join(f'new.{c} IS NULL' for c in columns),
+                assignments=assignments,
+            )))
+            if not exists:
+                # Backfill rows inserted without a default before the trigger
+                where = ' OR '.join(f'{c} IS NULL' for c in columns)
+                conn.execute(text(f"UPDATE {table.name} SET {assignments} WHERE {where}"))
+
+def create_fts_index():
+    """Create the publications FTS5 index and its sync triggers"""
+    with engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'publications_fts'"
+        )).first()
+        for ddl in FTS_DDL:
+            conn.execute(text(ddl))
+        if not exists:
+            # Index rows written before the FTS table existed
+            conn.execute(text("INSERT INTO publications_fts(publications_fts) VALUES ('rebuild')"))
+
+def add_missing_columns():
+    """Add model columns that are missing from already existing tables"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c['name'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+def rebuild_cascading_foreign_keys():
+    """Rebuild existing tables whose foreign keys lack the ON DELETE CASCADE
+    declared in the models (SQLite cannot ALTER a constraint)"""
+    inspector = inspect(engine)
+    stale = []
+    for table in Base.metadata.sorted_tables:
+        wanted = {(fk.parent.name, fk.ondelete.upper()) for fk in table.foreign_keys if fk.ondelete}
+        if not wanted or not inspector.has_table(table.name):
+            continue
+        existing = {
+            (fk['constrained_columns'][0], (fk['options'].get('ondelete') or '').upper())
+            for fk in inspector.get_foreign_keys(table.name)
+        }
+        if not wanted <= existing:
+            stale.append(table)
+    if not stale:
+        return
+    
+    with engine.connect() as conn:
+        # SQLite's documented table rebuild runs with foreign key enforcement
+        # off; the pragma is a no-op inside a transaction, hence the commits
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        conn.commit()
+        try:
+            with conn.begin():
+                for table in stale:
+                    old = f"{table.name}_old"
+                    columns = ', '.join(c.name for c in table.columns)
+                    # Skip rows that point at deleted parents; they would fail the new constraints
+                    orphan_free = ' AND '.join(
+                        f"({fk.parent.name} IS NULL OR {fk.parent.name} IN "
+                        f"(SELECT {fk.column.name} FROM {fk.column.table.name}))"
+                        for fk in table.foreign_keys
+                    )
+                    conn.execute(text(f"CREATE TABLE {old} AS SELECT * FROM {table.name}"))
+                    conn.execute(text(f"DROP TABLE {table.name}"))
+                    table.create(bind=conn)
+                    conn.execute(text(
+                        f"INSERT OR IGNORE INTO {table.name} ({columns}) "
+                        f"SELECT {columns} FROM {old} WHERE {orphan_free}"
+                    ))
+                    conn.execute(text(f"DROP TABLE {old}"))
+        finally:
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+            conn.commit()
+
 def create_tables():
     """Create all database tables"""
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    rebuild_cascading_foreign_keys()
+    # create_all skips indexes of tables that already exist
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    create_updated_at_triggers()
+    create_fts_index()
 
 def drop_tables():
     """Drop all database tables"""
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS publications_fts"))
     Base.metadata.drop_all(bind=engine)
\ No newline at end of file
@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .service import SEARCH_QUERY_LIMIT, get_database_service
+
+
+@contextmanager
+def count_queries(bind: Union[Engine, Connection], limit: Optional[int] = None) -> Iterator[List[str]]:
+    """Collect every SQL statement executed on bind while the block runs.
+
+    If limit is given, raises AssertionError on exit when more statements
+    were executed, which makes N+1 regressions fail loudly:
+
+        with count_queries(db.connection(), limit=5) as queries:
+            db_service.search_publications('bone', limit=20)
+
+    Pass the engine instead of a session connection to also count
+    statements issued after a commit.
+    """
+    queries: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+    if limit is not None and len(queries) > limit:
+        raise AssertionError(
+            f"Expected at most {limit} queries, got {len(queries)}:\n" + "\n\n".join(queries)
+        )
+
+
+def check_search_queries(db: Session, query: str = 'bone', limit: int = 20) -> List[str]:
+    """Run one search and raise AssertionError if it issues more than
+    SEARCH_QUERY_LIMIT statements (e.g. a relationship loaded per row)"""
+    with count_queries(db.connection(), limit=SEARCH_QUERY_LIMIT) as queries:
+        get_database_service(db).search_publications(query, limit=limit)
+    return queries
+
+
+if __name__ == "__main__":
+    # From services/api: python -m database.debug
+    from . import SessionLocal
+
+    with SessionLocal() as db:
+        queries = check_search_queries(db)
+    print(f"search_publications('bone', limit=20): {len(queries)} queries (limit {SEARCH_QUERY_LIMIT})")
@@ -1,30 +1,47 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, Table, Index, JSON, LargeBinary, FetchedValue
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, table, column
+from typing import List, Sequence
+import struct
 from . import Base
 
+def embedding_to_bytes(vector: Sequence[float]) -> bytes:
+    """Pack an embedding vector as little-endian float32 for SearchIndex.embedding"""
+    return struct.pack(f'<{len(vector)}f', *vector)
+
+def embedding_from_bytes(data: bytes) -> List[float]:
+    """Unpack SearchIndex.embedding (same layout as numpy.frombuffer(data, '<f4'))"""
+    return list(struct.unpack(f'<{len(data) // 4}f', data))
+
 # Association tables for many-to-many relationships
 publication_authors = Table(
     'publication_authors',
     Base.metadata,
-    Column('publication_id', Integer, ForeignKey('publications.id')),
-    Column('author_id', Integer, ForeignKey('authors.id'))
+    Column('publication_id', Integer, ForeignKey('publications.id', ondelete='CASCADE')),
+    Column('author_id', Integer, ForeignKey('authors.id', ondelete='CASCADE')),
+    Index('ix_publication_authors_pair', 'publication_id', 'author_id', unique=True)
 )
 
 publication_keywords = Table(
     'publication_keywords',
     Base.metadata,
-    Column('publication_id', Integer, ForeignKey('publications.id')),
-    Column('keyword_id', Integer, ForeignKey('keywords.id'))
+    Column('publication_id', Integer, ForeignKey('publications.id', ondelete='CASCADE')),
+    Column('keyword_id', Integer, ForeignKey('keywords.id', ondelete='CASCADE')),
+    Index('ix_publication_keywords_pair', 'publication_id', 'keyword_id', unique=True)
 )
 
 publication_missions = Table(
     'publication_missions',
     Base.metadata,
-    Column('publication_id', Integer, ForeignKey('publications.id')),
-    Column('mission_id', Integer, ForeignKey('missions.id'))
+    Column('publication_id', Integer, ForeignKey('publications.id', ondelete='CASCADE')),
+    Column('mission_id', Integer, ForeignKey('missions.id', ondelete='CASCADE')),
+    Index('ix_publication_missions_pair', 'publication_id', 'mission_id', unique=True)
 )
 
+# FTS5 index over publications (created in database.create_fts_index, not by
+# create_all); declared here only so queries can join against it
+publications_fts = table('publications_fts', column('rowid', Integer))
+
 class Publication(Base):
     __tablename__ = 'publications'
     
@@ -36,7 +53,7 @@ class Publication(Base):
     doi = Column(String, unique=True)
     url = Column(String)
     publication_date = Column(DateTime)
-    publication_year = Column(Integer, index=True)
+    publication_year = Column(Integer)  # indexed via ix_pub_year_org_dom
     publication_type = Column(String)  # journal, conference, report, etc.
     journal_name = Column(String)
     volume = Column(String)
@@ -49,18 +66,28 @@ class Publication(Base):
     
     # AI-generated fields
     ai_summary = Column(Text)
-    ai_tags = Column(Text)  # JSON string of tags
-    key_takeaways = Column(Text)  # JSON string of takeaways
+    ai_tags = Column(JSON)  # List of tags
+    key_takeaways = Column(JSON)  # List of takeaways
     
     # Metadata
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.current_timestamp(), server_onupdate=FetchedValue())  # set by trigger
     is_processed = Column(Boolean, default=False)  # AI processing complete
-    
-    # Relationships
-    authors = relationship("Author", secondary=publication_authors, back_populates="publications")
-    keywords = relationship("Keyword", secondary=publication_keywords, back_populates="publications")
-    missions = relationship("Mission", secondary=publication_missions, back_populates="publications")
+    content_hash = Column(String(16), index=True)  # Hash of normalized title+abstract, for dedup
+    
+    # Relationships (association rows are removed by ON DELETE CASCADE)
+    authors = relationship("Author", secondary=publication_authors, back_populates="publications",
+                           lazy='selectin', passive_deletes=True)
+    keywords = relationship("Keyword", secondary=publication_keywords, back_populates="publications",
+                            lazy='selectin', passive_deletes=True)
+    missions = relationship("Mission", secondary=publication_missions, back_populates="publications",
+                            lazy='selectin', passive_deletes=True)
+    
+    # Composite indexes for faceted search (filters + ORDER BY publication_year DESC)
+    __table_args__ = (
+        Index('ix_pub_year_org_dom', publication_year.desc(), organism_type, research_domain),
+        Index('ix_pub_type_year', publication_type, publication_year.desc()),
+    )
 
 class Author(Base):
     __tablename__ = 'authors'
@@ -72,10 +99,11 @@ class Author(Base):
     orcid = Column(String, unique=True)
     
     # Metadata
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
     
     # Relationships
-    publications = relationship("Publication", secondary=publication_authors, back_populates="authors")
+    publications = relationship("Publication", secondary=publication_authors, back_populates="authors",
+                                passive_deletes=True)
 
 class Keyword(Base):
     __tablename__ = 'keywords'
@@ -85,11 +113,12 @@ class Keyword(Base):
     category = Column(String)  # organism, mission, domain, method, etc.
     
     # Metadata
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
     usage_count = Column(Integer, default=0)
     
     # Relationships
-    publications = relationship("Publication", secondary=publication_keywords, back_populates="keywords")
+    publications = relationship("Publication", secondary=publication_keywords, back_populates="keywords",
+                                passive_deletes=True)
 
 class Mission(Base):
     __tablename__ = 'missions'
@@ -103,16 +132,17 @@ class Mission(Base):
     status = Column(String)  # active, completed, planned
     
     # Metadata
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
     
     # Relationships
-    publications = relationship("Publication", secondary=publication_missions, back_populates="missions")
+    publications = relationship("Publication", secondary=publication_missions, back_populates="missions",
+                                passive_deletes=True)
 
 class DataSource(Base):
     __tablename__ = 'data_sources'
     
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)  # NASA Open Data, PubSpace, etc.
+    name = Column(String, nullable=False, unique=True, index=True)  # NASA Open Data, PubSpace, etc.
     base_url = Column(String)
     api_endpoint = Column(String)
     last_sync = Column(DateTime)
@@ -120,19 +150,19 @@ class DataSource(Base):
     is_active = Column(Boolean, default=True)
     
     # Metadata
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.current_timestamp(), server_onupdate=FetchedValue())  # set by trigger
 
 class SearchIndex(Base):
     __tablename__ = 'search_index'
     
     id = Column(Integer, primary_key=True, index=True)
-    publication_id = Column(Integer, ForeignKey('publications.id'))
+    publication_id = Column(Integer, ForeignKey('publications.id', ondelete='CASCADE'))
     content = Column(Text)  # Preprocessed searchable content
-    embedding = Column(Text)  # JSON string of embedding vector (if using embeddings)
+    embedding = Column(LargeBinary)  # float32 embedding vector, see embedding_to_bytes
     
     # Metadata
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
     
     # Relationships
     publication = relationship("Publication")
@@ -146,11 +176,11 @@ class User(Base):
     email = Column(String, unique=True, index=True)
     full_name = Column(String)
     role = Column(String)  # student, researcher, admin
-    interests = Column(Text)  # JSON string of interests
+    interests = Column(JSON)  # List of interests
     
     # Metadata
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.current_timestamp(), server_onupdate=FetchedValue())  # set by trigger
     is_active = Column(Boolean, default=True)
 
 class UserFavorite(Base):
@@ -158,10 +188,10 @@ class UserFavorite(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'))
-    publication_id = Column(Integer, ForeignKey('publications.id'))
+    publication_id = Column(Integer, ForeignKey('publications.id', ondelete='CASCADE'))
     
     # Metadata
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
     
     # Relationships
     user = relationship("User")
@@ -173,12 +203,12 @@ class SearchLog(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=True)
     query = Column(String, nullable=False)
-    filters = Column(Text)  # JSON string of filters applied
+    filters = Column(JSON)  # Dict of filters applied
     results_count = Column(Integer)
     search_time = Column(Float)  # Time taken in seconds
     
     # Metadata
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, server_default=func.current_timestamp(), nullable=False)
     
     # Relationships
     user = relationship("User")
\ No newline at end of file
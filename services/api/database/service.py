@@ -1,22 +1,121 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
-from typing import List, Dict, Any, Optional
+from sqlalchemy.orm import Session, selectinload, raiseload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy import and_, desc, func, text, false, insert, bindparam, select
+from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
 import json
+import re
+import time
 from datetime import datetime
 
 from .models import (
     Publication, Author, Keyword, Mission, DataSource, 
     SearchIndex, User, UserFavorite, SearchLog,
-    publication_authors, publication_keywords, publication_missions
+    publication_authors, publication_keywords, publication_missions,
+    publications_fts
 )
 try:
-    from ..nasa_data.fetcher import NASADataFetcher
+    from ..nasa_data.classify import classify_publication
 except ImportError:
     # Handle direct script execution
-    import sys
-    from pathlib import Path
-    sys.path.append(str(Path(__file__).parent.parent))
-    from nasa_data.fetcher import NASADataFetcher
+    from nasa_data.classify import classify_publication
+
+
+_FTS_PHRASE = re.compile(r'"([^"]+)"')
+_FTS_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def build_fts_query(query: str) -> Optional[str]:
+    """Turn free-text user input into a safe FTS5 MATCH expression.
+
+    Quoted phrases are kept as phrases; everything is also OR-ed together as
+    individual tokens so partial matches still hit and BM25 ranks fuller
+    matches first. Returns None if the input has no searchable tokens.
+    """
+    phrases = [' '.join(_FTS_TOKEN.findall(p)) for p in _FTS_PHRASE.findall(query)]
+    tokens = _FTS_TOKEN.findall(query)
+    if not tokens:
+        return None
+
+    terms = [f'"{p}"' for p in phrases if p]
+    if len(tokens) > 1:
+        terms.append('"' + ' '.join(tokens) + '"')
+    terms.extend(f'"{t}"' for t in dict.fromkeys(tokens))
+    return ' OR '.join(dict.fromkeys(terms))
+
+
+def publication_content_hash(pub_data: Dict[str, Any]) -> Optional[str]:
+    """Hash of the normalized title+abstract, used to spot re-published duplicates"""
+    content = ' '.join(f"{pub_data.get('title') or ''} {pub_data.get('abstract') or ''}".lower().split())
+    if not content:
+        return None
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+
+
+# Relationships rendered by list/detail endpoints are loaded up front (one
+# IN query per relationship); any other relationship access raises instead
+# of silently lazy-loading once per row.
+PUBLICATION_LOAD_OPTIONS = (
+    selectinload(Publication.authors),
+    selectinload(Publication.keywords),
+    selectinload(Publication.missions),
+    raiseload('*'),
+)
+
+# Search results only render author names; skipping keywords and missions
+# saves two IN queries per page
+SEARCH_LOAD_OPTIONS = (
+    selectinload(Publication.authors),
+    raiseload('*'),
+)
+
+# Statements one search_publications call may issue: count, page, authors.
+# Checked by `python -m database.debug`
+SEARCH_QUERY_LIMIT = 3
+
+
+# Total plus per-organism, per-domain and per-year counts, as one result set
+# of (kind, value, count) rows
+PUBLICATION_STATS_SQL = """
+    SELECT 'by_organism' AS kind, organism_type AS value, count(*) AS n
+    FROM publications GROUP BY organism_type
+    UNION ALL
+    SELECT 'by_domain', research_domain, count(*)
+    FROM publications GROUP BY research_domain
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'by_year', publication_year, count(*)
+        FROM publications WHERE publication_year >= :min_year
+        GROUP BY publication_year ORDER BY publication_year
+    )
+    UNION ALL
+    SELECT 'total', NULL, count(*) FROM publications
+"""
+
+# Stats are read by dashboards far more often than publications change;
+# results are reused within a time bucket and keyed on data_version(), so a
+# result computed while a write lands is never served after it
+STATS_CACHE_SECONDS = 60
+_stats_cache: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+# Bumped on every committed publication write, so caches keyed on it
+# (e.g. /search responses) never serve results from before the write
+_data_version = 0
+
+def data_version() -> int:
+    """Number of committed publication writes in this process"""
+    return _data_version
+
+def _publications_changed():
+    global _data_version
+    _data_version += 1
+    _stats_cache.clear()
+
+# Publications written per transaction during NASA data ingestion
+INGEST_BATCH_SIZE = 500
 
 
 class DatabaseService:
@@ -24,52 +123,184 @@ class DatabaseService:
     
     def __init__(self, db: Session):
         self.db = db
+        self._fetcher = None
+    
+    @property
+    def fetcher(self):
+        """NASA data fetcher, imported and created on first use (ingestion only)"""
+        if self._fetcher is None:
+            # Deferred: pulls in httpx (with HTTP/2), orjson and bs4, which nothing else here needs
+            try:
+                from ..nasa_data.fetcher import NASADataFetcher
+            except ImportError:
+                from nasa_data.fetcher import NASADataFetcher
+            self._fetcher = NASADataFetcher()
+        return self._fetcher
         
     # Publication operations
     def create_publication(self, pub_data: Dict[str, Any]) -> Publication:
         """Create a new publication record"""
         
-        # Check if publication already exists
-        existing = self.db.query(Publication).filter(
-            Publication.nasa_id == pub_data.get('nasa_id')
-        ).first()
-        
-        if existing:
-            return existing
+        # Check if publication already exists (ID only, no row hydration)
+        nasa_id, _ = self._publication_keys(pub_data)
+        if nasa_id:
+            existing_id = self.db.query(Publication.id).filter(
+                Publication.nasa_id == nasa_id
+            ).scalar()
+            
+            if existing_id:
+                # Served from the identity map when already loaded
+                return self.db.get(Publication, existing_id)
             
         # Create publication
-        publication = Publication(
-            nasa_id=pub_data.get('nasa_id'),
-            title=pub_data.get('title', ''),
-            abstract=pub_data.get('abstract', ''),
-            doi=pub_data.get('doi'),
-            url=pub_data.get('url'),
-            publication_date=pub_data.get('publication_date'),
-            publication_year=pub_data.get('publication_year'),
-            publication_type=pub_data.get('publication_type', 'unknown'),
-            journal_name=pub_data.get('journal_name'),
-            organism_type=self._classify_organism_type(pub_data),
-            research_domain=self._classify_research_domain(pub_data)
-        )
+        publication = Publication(**self._prepare_publication_dict(pub_data))
         
         self.db.add(publication)
-        self.db.flush()  # Get the ID
         
         # Add authors
-        self._add_authors_to_publication(publication, pub_data.get('authors', []))
+        self._add_authors_to_publication(publication, pub_data.get('authors') or [])
         
         # Add keywords
-        self._add_keywords_to_publication(publication, pub_data.get('keywords', []))
-        
-        # Add to search index
-        self._create_search_index(publication)
+        self._add_keywords_to_publication(publication, pub_data.get('keywords') or [])
         
+        # Single flush for the publication and its associations; the full-text
+        # index is maintained by the publications_fts triggers
         self.db.commit()
+        _publications_changed()
         return publication
     
+    def bulk_create_publications(
+        self,
+        pubs: List[Dict[str, Any]],
+        source_name: Optional[str] = None,
+        errors: Optional[List[str]] = None
+    ) -> List[int]:
+        """Create many publications in a single transaction.
+        
+        Records without a title, or whose nasa_id, DOI or content hash is
+        already stored (or repeated earlier in the batch), are skipped. If the
+        batch still violates a constraint it is retried one record at a time,
+        so a bad record only loses itself; its error is appended to errors
+        when given. If source_name is given, that data source's sync time and
+        record count are updated in the same transaction. Returns the IDs of
+        the newly created rows.
+        """
+        hashes = [publication_content_hash(p) for p in pubs]
+        keys = [self._publication_keys(p) for p in pubs]
+        nasa_ids = {nasa_id for nasa_id, _ in keys if nasa_id}
+        dois = {doi for _, doi in keys if doi}
+        seen_ids = {i for (i,) in self.db.query(Publication.nasa_id).filter(Publication.nasa_id.in_(nasa_ids))}
+        seen_dois = {d for (d,) in self.db.query(Publication.doi).filter(Publication.doi.in_(dois))}
+        seen_hashes = {h for (h,) in self.db.query(Publication.content_hash).filter(
+            Publication.content_hash.in_({h for h in hashes if h})
+        )}
+        
+        new_pubs = []
+        for pub_data, content_hash, (nasa_id, doi) in zip(pubs, hashes, keys):
+            if not pub_data.get('title'):
+                continue
+            if ((nasa_id and nasa_id in seen_ids) or (doi and doi in seen_dois)
+                    or (content_hash and content_hash in seen_hashes)):
+                continue
+            seen_ids.add(nasa_id)
+            seen_dois.add(doi)
+            seen_hashes.add(content_hash)
+            new_pubs.append((pub_data, content_hash))
+        
+        if not new_pubs and not source_name:
+            return []
+        
+        try:
+            pub_ids = self._insert_publications(new_pubs)
+            if source_name:
+                self._update_data_source(source_name, len(pub_ids))
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            if len(new_pubs) <= 1:
+                raise
+            pub_ids = self._insert_publications_one_by_one(new_pubs, source_name, errors)
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        if pub_ids:
+            _publications_changed()
+        return list(pub_ids)
+    
+    def _insert_publications(self, new_pubs: List[Tuple[Dict[str, Any], Optional[str]]]) -> List[int]:
+        """INSERT (pub_data, content_hash) pairs with their author and keyword
+        links, without committing. Returns the new IDs in input order."""
+        if not new_pubs:
+            return []
+        pub_ids = self.db.scalars(
+            insert(Publication).returning(Publication.id, sort_by_parameter_order=True),
+            [self._prepare_publication_dict(p, content_hash) for p, content_hash in new_pubs]
+        ).all()
+        
+        pub_authors = [self._clean_names(p.get('authors') or []) for p, _ in new_pubs]
+        pub_keywords = [self._clean_names(p.get('keywords') or []) for p, _ in new_pubs]
+        authors = self._get_or_create_authors([n for names in pub_authors for n in names])
+        keywords = self._get_or_create_keywords(Counter(t for terms in pub_keywords for t in terms))
+        
+        author_rows = [
+            {'publication_id': pub_id, 'author_id': authors[name].id}
+            for pub_id, names in zip(pub_ids, pub_authors) for name in names
+        ]
+        keyword_rows = [
+            {'publication_id': pub_id, 'keyword_id': keywords[term].id}
+            for pub_id, terms in zip(pub_ids, pub_keywords) for term in terms
+        ]
+        if author_rows:
+            self.db.execute(publication_authors.insert(), author_rows)
+        if keyword_rows:
+            self.db.execute(publication_keywords.insert(), keyword_rows)
+        return list(pub_ids)
+    
+    def _insert_publications_one_by_one(
+        self,
+        new_pubs: List[Tuple[Dict[str, Any], Optional[str]]],
+        source_name: Optional[str],
+        errors: Optional[List[str]]
+    ) -> List[int]:
+        """Fallback for a batch that violated a constraint: commit each record
+        on its own and report the ones that fail"""
+        pub_ids = []
+        for pub_row in new_pubs:
+            try:
+                pub_ids += self._insert_publications([pub_row])
+                self.db.commit()
+            except IntegrityError as e:
+                self.db.rollback()
+                if errors is not None:
+                    errors.append(f"Skipped publication {pub_row[0].get('title')!r}: {e.orig}")
+        
+        if source_name:
+            try:
+                self._update_data_source(source_name, len(pub_ids))
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+        return pub_ids
+    
     def get_publication(self, publication_id: int) -> Optional[Publication]:
         """Get publication by ID"""
-        return self.db.query(Publication).filter(Publication.id == publication_id).first()
+        return self.db.query(Publication).options(*PUBLICATION_LOAD_OPTIONS).filter(
+            Publication.id == publication_id
+        ).first()
+    
+    def stream_publications(self, batch_size: int = 500):
+        """Iterate over every publication in fixed-size batches.
+        
+        Rows are fetched from the cursor batch_size at a time (with their
+        collections selectin-loaded per batch) instead of all at once, so
+        memory stays constant for full-corpus exports or re-indexing.
+        """
+        stmt = select(Publication).options(
+            selectinload(Publication.authors)
+        ).execution_options(stream_results=True, yield_per=batch_size).order_by(Publication.id)
+        return self.db.scalars(stmt)
     
     def search_publications(
         self, 
@@ -80,7 +311,7 @@ class DatabaseService:
     ) -> Dict[str, Any]:
         """Search publications with filters"""
         
-        base_query = self.db.query(Publication)
+        base_query = self.db.query(Publication).options(*SEARCH_LOAD_OPTIONS)
         
         # Apply filters
         if filters:
@@ -93,19 +324,24 @@ class DatabaseService:
             if filters.get('publication_type'):
                 base_query = base_query.filter(Publication.publication_type == filters['publication_type'])
         
-        # Apply text search
-        if query:
-            search_filter = or_(
-                Publication.title.ilike(f'%{query}%'),
-                Publication.abstract.ilike(f'%{query}%')
-            )
-            base_query = base_query.filter(search_filter)
+        # Apply text search (FTS5 index, ranked by BM25)
+        ordering = [desc(Publication.publication_year)]
+        fts_query = build_fts_query(query) if query else None
+        if query and not fts_query:
+            base_query = base_query.filter(false())
+        elif fts_query:
+            base_query = base_query.join(
+                publications_fts, publications_fts.c.rowid == Publication.id
+            ).filter(
+                text('publications_fts MATCH :fts_query')
+            ).params(fts_query=fts_query)
+            ordering.insert(0, text('bm25(publications_fts)'))
         
         # Get total count
         total = base_query.count()
         
         # Apply pagination and ordering
-        publications = base_query.order_by(desc(Publication.publication_year)).offset(offset).limit(limit).all()
+        publications = base_query.order_by(*ordering).offset(offset).limit(limit).all()
         
         return {
             'publications': publications,
@@ -115,75 +351,88 @@ class DatabaseService:
         }
     
     def get_publication_stats(self) -> Dict[str, Any]:
-        """Get publication statistics"""
-        total_pubs = self.db.query(Publication).count()
-        
-        # Publications by organism type
-        organism_stats = self.db.query(
-            Publication.organism_type, 
-            func.count(Publication.id)
-        ).group_by(Publication.organism_type).all()
-        
-        # Publications by research domain
-        domain_stats = self.db.query(
-            Publication.research_domain, 
-            func.count(Publication.id)
-        ).group_by(Publication.research_domain).all()
-        
-        # Publications by year (last 10 years)
-        current_year = datetime.now().year
-        year_stats = self.db.query(
-            Publication.publication_year, 
-            func.count(Publication.id)
-        ).filter(
-            Publication.publication_year >= current_year - 10
-        ).group_by(Publication.publication_year).order_by(Publication.publication_year).all()
+        """Get publication statistics (cached for STATS_CACHE_SECONDS)"""
+        # Read the version before computing, like the /search cache key
+        cache_key = (int(time.monotonic() // STATS_CACHE_SECONDS), data_version())
+        stats = _stats_cache.get(cache_key)
+        if stats is None:
+            stats = self._compute_publication_stats()
+            _stats_cache.clear()
+            _stats_cache[cache_key] = stats
+        return stats
+    
+    def _compute_publication_stats(self) -> Dict[str, Any]:
+        """Compute all publication aggregates in a single query"""
+        rows = self.db.execute(
+            text(PUBLICATION_STATS_SQL),
+            {'min_year': datetime.now().year - 10}  # last 10 years
+        ).all()
         
-        return {
-            'total_publications': total_pubs,
-            'by_organism': dict(organism_stats),
-            'by_domain': dict(domain_stats),
-            'by_year': dict(year_stats)
+        stats = {
+            'total_publications': 0,
+            'by_organism': {},
+            'by_domain': {},
+            'by_year': {}
         }
+        for kind, value, count in rows:
+            if kind == 'total':
+                stats['total_publications'] = count
+            else:
+                stats[kind][value] = count
+        return stats
     
     # NASA data ingestion
     def ingest_nasa_data(self, source_name: str, limit: int = 100) -> Dict[str, Any]:
         """Ingest data from NASA sources"""
-        fetcher = NASADataFetcher()
+        fetcher = self.fetcher
         ingested = 0
+        synced = False
         errors = []
         
-        try:
-            if source_name.lower() == 'ntrs':
-                publications = fetcher.search_nasa_techreports(limit=limit)
-            elif source_name.lower() == 'open_data':
-                publications = fetcher.search_nasa_open_data()
-            elif source_name.lower() == 'pubspace':
-                publications = fetcher.search_pubspace(limit=limit)
-            else:
-                # Try all sources
-                publications = []
-                publications.extend(fetcher.search_nasa_techreports(limit=limit//3))
-                publications.extend(fetcher.search_nasa_open_data())
-                publications.extend(fetcher.search_pubspace(limit=limit//3))
-            
-            # Store publications
-            for pub_data in publications:
+        if source_name.lower() == 'ntrs':
+            jobs = [(fetcher.search_nasa_techreports, {'limit': limit})]
+        elif source_name.lower() == 'open_data':
+            jobs = [(fetcher.search_nasa_open_data, {})]
+        elif source_name.lower() == 'pubspace':
+            jobs = [(fetcher.search_pubspace, {'limit': limit})]
+        else:
+            # Try all sources
+            jobs = [
+                (fetcher.search_nasa_techreports, {'limit': limit//3}),
+                (fetcher.search_nasa_open_data, {}),
+                (fetcher.search_pubspace, {'limit': limit//3}),
+            ]
+        
+        # Fetch sources concurrently (network bound) and store each one's
+        # results as soon as it arrives, in batches of INGEST_BATCH_SIZE
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = [pool.submit(fetch, **kwargs) for fetch, kwargs in jobs]
+            for future in as_completed(futures):
                 try:
-                    # Enhance with classifications
-                    pub_data['organism_type'] = fetcher.classify_organism_type(pub_data)
-                    pub_data['research_domain'] = fetcher.classify_research_domain(pub_data)
-                    
-                    self.create_publication(pub_data)
-                    ingested += 1
+                    publications = future.result()
                 except Exception as e:
-                    errors.append(f"Error processing {pub_data.get('title', 'Unknown')}: {str(e)}")
-            
-            # Update data source record
-            self._update_data_source(source_name, ingested)
-            
-        except Exception as e:
-            errors.append(f"Error fetching from {source_name}: {str(e)}")
+                    errors.append(f"Error fetching from {source_name}: {str(e)}")
+                    continue
+                
+                # Data source stats are updated in each batch's transaction
+                for start in range(0, len(publications), INGEST_BATCH_SIZE):
+                    batch = publications[start:start + INGEST_BATCH_SIZE]
+                    try:
+                        ingested += len(self.bulk_create_publications(
+                            batch, source_name=source_name, errors=errors
+                        ))
+                        synced = True
+                    except Exception as e:
+                        errors.append(f"Error storing publications from {source_name}: {str(e)}")
+        
+        if not synced:
+            try:
+                # Nothing stored; still record the sync attempt
+                self._update_data_source(source_name, 0)
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                errors.append(f"Error updating data source {source_name}: {str(e)}")
         
         return {
             'source': source_name,
@@ -193,78 +442,126 @@ class DatabaseService:
         }
     
     # Helper methods
+    def _prepare_publication_dict(
+        self,
+        pub_data: Dict[str, Any],
+        content_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Map fetched publication data onto Publication columns.
+        
+        Pass content_hash when the caller has already computed it.
+        """
+        if content_hash is None:
+            content_hash = publication_content_hash(pub_data)
+        nasa_id, doi = self._publication_keys(pub_data)
+        organism_type, research_domain = classify_publication(pub_data)
+        return {
+            'nasa_id': nasa_id,
+            'title': pub_data.get('title') or '',
+            'abstract': pub_data.get('abstract') or '',
+            'doi': doi,
+            'url': pub_data.get('url'),
+            'publication_date': pub_data.get('publication_date'),
+            'publication_year': pub_data.get('publication_year'),
+            'publication_type': pub_data.get('publication_type', 'unknown'),
+            'journal_name': pub_data.get('journal_name'),
+            'organism_type': organism_type,
+            'research_domain': research_domain,
+            'content_hash': content_hash,
+        }
+    
+    @staticmethod
+    def _publication_keys(pub_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """(nasa_id, doi) as stored: both are unique TEXT columns, so ids are
+        stringified (NTRS returns numbers) and empty values become NULL"""
+        nasa_id, doi = pub_data.get('nasa_id'), pub_data.get('doi')
+        return (str(nasa_id) if nasa_id else None), (doi or None)
+    
+    @staticmethod
+    def _clean_names(names: List[str]) -> List[str]:
+        """Strip names and drop blanks/duplicates, keeping input order"""
+        return list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+    
+    def _get_or_create_authors(self, names: List[str]) -> Dict[str, Author]:
+        """Resolve author names to Author rows, creating any that don't exist yet"""
+        names = list(dict.fromkeys(names))
+        if not names:
+            return {}
+        
+        # One IN query for the existing authors, one multi-row INSERT for the rest
+        authors = {a.name: a for a in self.db.query(Author).filter(Author.name.in_(names))}
+        missing = [n for n in names if n not in authors]
+        if missing:
+            created = self.db.scalars(
+                insert(Author).returning(Author), [{'name': n} for n in missing]
+            )
+            authors.update((a.name, a) for a in created)
+        return authors
+    
+    def _get_or_create_keywords(self, term_counts: Dict[str, int]) -> Dict[str, Keyword]:
+        """Resolve keyword terms to Keyword rows and add term_counts to their usage_count"""
+        if not term_counts:
+            return {}
+        
+        keywords = {k.term: k for k in self.db.query(Keyword).filter(Keyword.term.in_(term_counts))}
+        
+        # Increment usage count of known keywords in a single executemany UPDATE
+        if keywords:
+            table = Keyword.__table__
+            self.db.execute(
+                table.update().where(table.c.term == bindparam('b_term')).values(
+                    usage_count=table.c.usage_count + bindparam('b_count')
+                ),
+                [{'b_term': t, 'b_count': term_counts[t]} for t in keywords]
+            )
+        
+        missing = [t for t in term_counts if t not in keywords]
+        if missing:
+            created = self.db.scalars(
+                insert(Keyword).returning(Keyword),
+                [{'term': t, 'usage_count': term_counts[t]} for t in missing]
+            )
+            keywords.update((k.term, k) for k in created)
+        return keywords
+    
     def _add_authors_to_publication(self, publication: Publication, author_names: List[str]):
         """Add authors to publication"""
-        for author_name in author_names:
-            if not author_name.strip():
-                continue
-                
-            # Find or create author
-            author = self.db.query(Author).filter(Author.name == author_name.strip()).first()
-            if not author:
-                author = Author(name=author_name.strip())
-                self.db.add(author)
-                self.db.flush()
-            
-            # Add to publication
-            if author not in publication.authors:
+        names = self._clean_names(author_names)
+        authors = self._get_or_create_authors(names)
+        linked_ids = {a.id for a in publication.authors}
+        for name in names:
+            author = authors[name]
+            if author.id not in linked_ids:
                 publication.authors.append(author)
+                linked_ids.add(author.id)
     
     def _add_keywords_to_publication(self, publication: Publication, keywords: List[str]):
         """Add keywords to publication"""
-        for keyword_term in keywords:
-            if not keyword_term.strip():
-                continue
-                
-            # Find or create keyword
-            keyword = self.db.query(Keyword).filter(Keyword.term == keyword_term.strip()).first()
-            if not keyword:
-                keyword = Keyword(term=keyword_term.strip())
-                self.db.add(keyword)
-                self.db.flush()
-            
-            # Increment usage count
-            keyword.usage_count += 1
-            
-            # Add to publication
-            if keyword not in publication.keywords:
+        terms = self._clean_names(keywords)
+        found = self._get_or_create_keywords(Counter(terms))
+        linked_ids = {k.id for k in publication.keywords}
+        for term in terms:
+            keyword = found[term]
+            if keyword.id not in linked_ids:
                 publication.keywords.append(keyword)
-    
-    def _create_search_index(self, publication: Publication):
-        """Create search index entry for publication"""
-        content = f"{publication.title} {publication.abstract or ''}"
-        
-        search_entry = SearchIndex(
-            publication_id=publication.id,
-            content=content.strip()
-        )
-        self.db.add(search_entry)
-    
-    def _classify_organism_type(self, pub_data: Dict[str, Any]) -> str:
-        """Classify organism type from publication data"""
-        fetcher = NASADataFetcher()
-        return fetcher.classify_organism_type(pub_data)
-    
-    def _classify_research_domain(self, pub_data: Dict[str, Any]) -> str:
-        """Classify research domain from publication data"""
-        fetcher = NASADataFetcher()
-        return fetcher.classify_research_domain(pub_data)
+                linked_ids.add(keyword.id)
     
     def _update_data_source(self, source_name: str, records_count: int):
-        """Update data source statistics"""
-        data_source = self.db.query(DataSource).filter(DataSource.name == source_name).first()
-        
-        if not data_source:
-            data_source = DataSource(
-                name=source_name,
-                total_records=0
-            )
-            self.db.add(data_source)
-        
-        data_source.last_sync = datetime.now()
-        data_source.total_records += records_count
-        
-        self.db.commit()
+        """Update data source statistics (single upsert, committed by the caller)"""
+        now = datetime.now()
+        table = DataSource.__table__
+        stmt = sqlite_insert(table).values(
+            name=source_name,
+            total_records=records_count,
+            last_sync=now
+        ).on_conflict_do_update(
+            index_elements=['name'],
+            set_={
+                'last_sync': now,
+                'total_records': func.coalesce(table.c.total_records, 0) + records_count
+            }
+        )
+        self.db.execute(stmt)
 
 
 def get_database_service(db: Session) -> DatabaseService:
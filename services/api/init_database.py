@@ -16,6 +16,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from database import create_tables, get_database, SessionLocal
+from sqlalchemy.dialects.sqlite import insert
 from database.models import Mission, DataSource
 from database.service import get_database_service
 from nasa_data.fetcher import get_nasa_data_fetcher
@@ -30,7 +31,8 @@ def init_missions(db_session):
             'description': 'International Space Station - ongoing laboratory in low Earth orbit',
             'mission_type': 'Space Station',
             'status': 'active',
-            'start_date': datetime(1998, 11, 20)
+            'start_date': datetime(1998, 11, 20),
+            'end_date': None
         },
         {
             'name': 'Apollo',
@@ -53,18 +55,16 @@ def init_missions(db_session):
             'description': 'Artemis lunar exploration program',
             'mission_type': 'Lunar',
             'status': 'planned',
-            'start_date': datetime(2024, 1, 1)
+            'start_date': datetime(2024, 1, 1),
+            'end_date': None
         }
     ]
     
-    for mission_data in missions:
-        existing = db_session.query(Mission).filter(Mission.name == mission_data['name']).first()
-        if not existing:
-            mission = Mission(**mission_data)
-            db_session.add(mission)
-            print(f"Added mission: {mission_data['name']}")
-    
+    # Single statement; missions that already exist are left untouched
+    stmt = insert(Mission.__table__).on_conflict_do_nothing(index_elements=['name'])
+    result = db_session.execute(stmt, missions)
     db_session.commit()
+    print(f"Added {result.rowcount} missions")
 
 
 def init_data_sources(db_session):
@@ -90,14 +90,11 @@ def init_data_sources(db_session):
         }
     ]
     
-    for source_data in sources:
-        existing = db_session.query(DataSource).filter(DataSource.name == source_data['name']).first()
-        if not existing:
-            source = DataSource(**source_data)
-            db_session.add(source)
-            print(f"Added data source: {source_data['name']}")
-    
+    # Single statement; sources that already exist are left untouched
+    stmt = insert(DataSource.__table__).on_conflict_do_nothing(index_elements=['name'])
+    result = db_session.execute(stmt, sources)
     db_session.commit()
+    print(f"Added {result.rowcount} data sources")
 
 
 def seed_sample_publications(db_session):
@@ -1,23 +1,30 @@
 from fastapi import FastAPI, Body, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
+import asyncio
+import hashlib
 import math
 import re
 import os
 from functools import lru_cache
 import google.generativeai as genai
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import json
+from collections import Counter
 
 try:
-    from .database import get_database, create_tables
-    from .database.service import get_database_service
+    from .cache import TTLCache
+    from .database import get_database, get_async_database, create_tables
+    from .database.service import get_database_service, data_version
     from .database.models import Publication
 except ImportError:
     # Handle direct script execution
-    from database import get_database, create_tables
-    from database.service import get_database_service
+    from cache import TTLCache
+    from database import get_database, get_async_database, create_tables
+    from database.service import get_database_service, data_version
     from database.models import Publication
 
 app = FastAPI(
@@ -27,6 +34,9 @@ app = FastAPI(
         "APIs for summarization, semantic search, knowledge graph access, and visualizations "
         "for NASA bioscience research related to Moon and Mars."
     ),
+    # orjson renders the (large) search/publication payloads several times
+    # faster than the stdlib encoder
+    default_response_class=ORJSONResponse,
 )
 
 # Initialize database on startup
@@ -107,6 +117,11 @@ def configure_gemini() -> bool:
     genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
     return True
 
+@lru_cache(maxsize=32)
+def _get_model(model_name: str, system_instruction: str) -> genai.GenerativeModel:
+    # Models hold no per-request state, so one instance per prompt setup is shared
+    return genai.GenerativeModel(model_name=model_name, system_instruction=system_instruction)
+
 _STOPWORDS = {
     "the","and","a","an","in","on","for","of","to","is","are","was","were","be","been","being",
     "with","by","as","at","that","this","these","those","it","its","from","or","we","our","you",
@@ -116,25 +131,31 @@ _STOPWORDS = {
 }
 
 _SENT_SPLIT = re.compile(r"(?<=[.!?])\s+")
-_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+# Tokens of two or more characters; shorter runs never match, so there
+# is no separate length filter or empty-string pass
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+
+# Parsers for the free-form LLM summary
+_PARA_SPLIT = re.compile(r"\n\s*\n")
+_TAKEAWAY_HDR = re.compile(r"takeaways|bullets|key points", re.I)
+_TAGS_HDR = re.compile(r"tags|topics|labels", re.I)
+_BULLET_PREFIX = re.compile(r"^[-•\s]+")
+_TAG_PREFIX = re.compile(r"^[#\-\s]+")
+_TAG_SEP = re.compile(r"[,\n]")
 
 
 def _sentences(text: str) -> List[str]:
-    # simple sentence split on punctuation
-    sents = re.split(r"(?<=[.!?])\s+", text.strip())
-    return [s.strip() for s in sents if s.strip()]
+    # simple sentence split on punctuation; the split consumes the
+    # whitespace between sentences, so pieces need no further stripping
+    return [s for s in _SENT_SPLIT.split(text.strip()) if s]
 
 
 def _tokens(text: str) -> List[str]:
-    toks = [t for t in _TOKEN_SPLIT.split(text.lower()) if t]
-    return [t for t in toks if t not in _STOPWORDS and len(t) > 1]
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
 
 
 def _top_keywords(text: str, k: int = 5) -> List[str]:
-    freq: Dict[str, int] = {}
-    for t in _tokens(text):
-        freq[t] = freq.get(t, 0) + 1
-    return [w for w, _ in sorted(freq.items(), key=lambda kv: kv[1], reverse=True)[:k]]
+    return [w for w, _ in Counter(_tokens(text)).most_common(k)]
 
 
 def _cosine_sim(q: Dict[str, float], d: Dict[str, float]) -> float:
@@ -144,29 +165,23 @@ def _cosine_sim(q: Dict[str, float], d: Dict[str, float]) -> float:
     return dot / (nq * nd)
 
 
-def _bow(text: str) -> Dict[str, float]:
-    vec: Dict[str, float] = {}
-    for t in _tokens(text):
-        vec[t] = vec.get(t, 0.0) + 1.0
-    return vec
+def _bow(text: str) -> Counter:
+    return Counter(_tokens(text))
 
 # Embeddings helpers (optional, if GEMINI is configured)
 @lru_cache(maxsize=1)
 def _corpus_embeddings() -> Optional[List[List[float]]]:
     if not configure_gemini():
         return None
-    vecs: List[List[float]] = []
+    texts = [f"{d['title']}\n{d['abstract']}" for d in _SAMPLE_DOCS]
     try:
-        for d in _SAMPLE_DOCS:
-            text = f"{d['title']}\n{d['abstract']}"
-            resp = genai.embed_content(model="text-embedding-004", content=text)
-            emb = resp.get("embedding") or resp.get("data", {}).get("embedding")
-            # Some SDK versions return dict with 'embedding' directly as list
-            if isinstance(emb, list):
-                vecs.append(emb)
-            elif isinstance(resp, dict) and "embedding" in resp:
-                vecs.append(resp["embedding"])  # type: ignore
-        return vecs if vecs else None
+        # A list of contents goes out as batchEmbedContents: one round trip
+        # per 100 docs instead of one per doc
+        resp = genai.embed_content(model="text-embedding-004", content=texts)
+        vecs = resp.get("embedding")
+        if isinstance(vecs, list) and len(vecs) == len(texts):
+            return vecs
+        return None
     except Exception:
         return None
 
@@ -241,8 +256,13 @@ def health():
     return {"status": "ok"}
 
 
+# Users iterate on the same document, so Gemini summaries are reused per
+# (text digest, language); the naive fallback is cheap and never cached
+_summary_cache = TTLCache(maxsize=512, ttl=3600)
+
+
 @app.post("/summarize", response_model=SummarizeResponse)
-def summarize(req: SummarizeRequest):
+async def summarize(req: SummarizeRequest):
     text = (req.text or "").strip()
     lang = (req.language or "en").lower()
     if not text:
@@ -250,6 +270,10 @@ def summarize(req: SummarizeRequest):
 
 # If Gemini is configured, ask an LLM for a short abstract, takeaways, and tags
     if configure_gemini():
+        cache_key = (hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(), lang)
+        cached = _summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
         sys = (
             "You are AstroBio Buddy, assisting with NASA bioscience literature. "
             "Return a concise abstract (~2-3 sentences), 3-5 bullet key takeaways, and 3-6 topical tags. "
@@ -258,27 +282,32 @@ def summarize(req: SummarizeRequest):
         )
         user = f"Summarize the following text. Language: {lang}.\n\n{text}"
         try:
-            model = genai.GenerativeModel(model_name="gemini-1.5-pro", system_instruction=sys)
-            resp = model.generate_content(user)
+            model = _get_model("gemini-1.5-pro", sys)
+            resp = await model.generate_content_async(user)
             content = getattr(resp, "text", None) or ""
             # Heuristic parse: split sections by headers if present
             abstract = content
             key_takeaways = []
             ai_tags = []
-            parts = re.split(r"\n\s*\n", content)
+            parts = _PARA_SPLIT.split(content)
             if parts:
                 abstract = parts[0].strip()
                 for p in parts[1:]:
-                    if len(key_takeaways) < 1 and re.search(r"takeaways|bullets|key points", p, re.I):
-                        key_takeaways = [re.sub(r"^[-•\s]+", "", x).strip() for x in p.splitlines() if x.strip()][:5]
-                    if len(ai_tags) < 1 and re.search(r"tags|topics|labels", p, re.I):
-                        ai_tags = [re.sub(r"^[#-\s]+", "", x).strip() for x in re.split(r",|\n", p) if x.strip()][:6]
-            if not key_takeaways:
-                kws = _top_keywords(text, k=6)
-                key_takeaways = [f"Keyword: {w}" for w in kws[:3]]
-            if not ai_tags:
-                ai_tags = [w.title() for w in _top_keywords(text, k=5)]
-            return SummarizeResponse(abstract=abstract, key_takeaways=key_takeaways, ai_tags=ai_tags)
+                    if len(key_takeaways) < 1 and _TAKEAWAY_HDR.search(p):
+                        key_takeaways = [_BULLET_PREFIX.sub("", x).strip() for x in p.splitlines() if x.strip()][:5]
+                    if len(ai_tags) < 1 and _TAGS_HDR.search(p):
+                        ai_tags = [_TAG_PREFIX.sub("", x).strip() for x in _TAG_SEP.split(p) if x.strip()][:6]
+            if not key_takeaways or not ai_tags:
+                # One tokenization serves both fallbacks (most_common is a
+                # stable sort, so the top 5 are a prefix of the top 6)
+                keywords = _top_keywords(text, k=6)
+                if not key_takeaways:
+                    key_takeaways = [f"Keyword: {w}" for w in keywords[:3]]
+                if not ai_tags:
+                    ai_tags = [w.title() for w in keywords[:5]]
+            result = SummarizeResponse(abstract=abstract, key_takeaways=key_takeaways, ai_tags=ai_tags)
+            _summary_cache.set(cache_key, result)
+            return result
         except Exception:
             # fall through to naive path
             pass
@@ -292,21 +321,28 @@ def summarize(req: SummarizeRequest):
     return SummarizeResponse(abstract=abstract, key_takeaways=key_takeaways, ai_tags=ai_tags)
 
 
-@app.post("/search", response_model=PublicationListResponse)
-def search(req: SearchRequest, db: Session = Depends(get_database)):
+# Search is read-dominated with a small filter space (dashboards polling,
+# crawled pagination): reuse responses briefly, keyed on the data version
+# so any committed write makes earlier entries unreachable
+_search_cache = TTLCache(maxsize=1024, ttl=60)
+
+
+def _publication_response(pub: Publication) -> PublicationResponse:
+    return PublicationResponse(
+        id=pub.id,
+        title=pub.title,
+        abstract=pub.abstract,
+        authors=[author.name for author in pub.authors],
+        publication_year=pub.publication_year,
+        organism_type=pub.organism_type,
+        research_domain=pub.research_domain,
+        url=pub.url
+    )
+
+
+def _search_response(db: Session, req: SearchRequest, db_filters: Dict[str, Any]) -> PublicationListResponse:
     db_service = get_database_service(db)
     
-    # Convert old filter format to new format
-    db_filters = {}
-    if req.filters:
-        if "organism" in req.filters:
-            db_filters["organism_type"] = req.filters["organism"]
-        if "mission" in req.filters:
-            # For now, we'll search in research_domain
-            db_filters["research_domain"] = req.filters["mission"]
-        if "year" in req.filters:
-            db_filters["publication_year"] = int(req.filters["year"])
-    
     # Search database
     search_result = db_service.search_publications(
         query=req.query,
@@ -316,28 +352,39 @@ def search(req: SearchRequest, db: Session = Depends(get_database)):
     )
     
     # Convert to response format
-    publications = []
-    for pub in search_result['publications']:
-        pub_response = PublicationResponse(
-            id=pub.id,
-            title=pub.title,
-            abstract=pub.abstract,
-            authors=[author.name for author in pub.authors],
-            publication_year=pub.publication_year,
-            organism_type=pub.organism_type,
-            research_domain=pub.research_domain,
-            url=pub.url
-        )
-        publications.append(pub_response)
-    
     return PublicationListResponse(
-        publications=publications,
+        publications=[_publication_response(pub) for pub in search_result['publications']],
         total=search_result['total'],
         offset=search_result['offset'],
         limit=search_result['limit']
     )
 
 
+@app.post("/search", response_model=PublicationListResponse)
+async def search(req: SearchRequest, db: AsyncSession = Depends(get_async_database)):
+    # Convert old filter format to new format
+    db_filters = {}
+    if req.filters:
+        if "organism" in req.filters:
+            db_filters["organism_type"] = req.filters["organism"]
+        if "mission" in req.filters:
+            # For now, we'll search in research_domain
+            db_filters["research_domain"] = req.filters["mission"]
+        if "year" in req.filters:
+            db_filters["publication_year"] = int(req.filters["year"])
+    
+    cache_key = (data_version(), req.query, tuple(sorted(db_filters.items())), req.offset, req.limit)
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # The service is sync: run it, and the mapping that reads the loaded
+    # relationships, on the async connection
+    response = await db.run_sync(_search_response, req, db_filters)
+    _search_cache.set(cache_key, response)
+    return response
+
+
 # -----------------------------
 # NASA Data Management endpoints
 # -----------------------------
@@ -356,31 +403,23 @@ def ingest_nasa_data(req: NASAIngestRequest, db: Session = Depends(get_database)
 
 
 @app.get("/nasa-data/stats")
-def get_nasa_data_stats(db: Session = Depends(get_database)):
+async def get_nasa_data_stats(db: AsyncSession = Depends(get_async_database)):
     """Get statistics about stored NASA data"""
-    db_service = get_database_service(db)
-    return db_service.get_publication_stats()
+    return await db.run_sync(lambda s: get_database_service(s).get_publication_stats())
 
 
 @app.get("/publications/{publication_id}")
-def get_publication(publication_id: int, db: Session = Depends(get_database)):
+async def get_publication(publication_id: int, db: AsyncSession = Depends(get_async_database)):
     """Get a specific publication by ID"""
-    db_service = get_database_service(db)
-    publication = db_service.get_publication(publication_id)
+    def load(s: Session) -> Optional[PublicationResponse]:
+        publication = get_database_service(s).get_publication(publication_id)
+        return _publication_response(publication) if publication else None
     
-    if not publication:
+    response = await db.run_sync(load)
+    if not response:
         raise HTTPException(status_code=404, detail="Publication not found")
     
-    return PublicationResponse(
-        id=publication.id,
-        title=publication.title,
-        abstract=publication.abstract,
-        authors=[author.name for author in publication.authors],
-        publication_year=publication.publication_year,
-        organism_type=publication.organism_type,
-        research_domain=publication.research_domain,
-        url=publication.url
-    )
+    return response
 
 
 # -----------------------------
@@ -394,37 +433,60 @@ class ChatMessage(BaseModel):
 class ChatRequest(BaseModel):
     messages: List[ChatMessage]
     system: Optional[str] = None
+    stream: bool = False  # reply as text/plain chunks while the model generates
+
+_CHAT_UNAVAILABLE = "AstroBio Buddy is temporarily unavailable. Please check your GEMINI_API_KEY or try again later. Meanwhile, use Search and Summarize above."
+_CHAT_NOT_CONFIGURED = "AstroBio Buddy is not configured. Set GEMINI_API_KEY to enable chat, or use Search and Summarize."
+
+
+async def _stream_reply(model: genai.GenerativeModel, prompt: str) -> AsyncIterator[str]:
+    sent = False
+    try:
+        resp = await model.generate_content_async(prompt, stream=True)
+        async for chunk in resp:
+            text = chunk.text
+            if text:
+                sent = True
+                yield text
+    except Exception:
+        yield ("\n\n" if sent else "") + _CHAT_UNAVAILABLE
+
 
 @app.post("/chat")
-def chat(req: ChatRequest):
+async def chat(req: ChatRequest):
     if configure_gemini():
         sys = req.system or (
             "You are AstroBio Buddy, an assistant for NASA bioscience exploration. "
             "Be concise, cite concepts from the provided demo corpus when relevant, and avoid fabricating sources."
         )
+        model = _get_model("gemini-1.5-pro", sys)
+        # Format a lightweight transcript
+        convo = []
+        for m in req.messages[-10:]:
+            role = m.role.lower()
+            if role not in ("system", "user", "assistant"):
+                continue
+            convo.append(f"{role.title()}: {m.content}")
+        prompt = "\n".join(convo) if convo else "User: Hello\nAssistant:"
+        if req.stream:
+            # First tokens reach the client as soon as Gemini emits them
+            return StreamingResponse(_stream_reply(model, prompt), media_type="text/plain; charset=utf-8")
         try:
-            model = genai.GenerativeModel(model_name="gemini-1.5-pro", system_instruction=sys)
-            # Format a lightweight transcript
-            convo = []
-            for m in req.messages[-10:]:
-                role = m.role.lower()
-                if role not in ("system", "user", "assistant"):
-                    continue
-                convo.append(f"{role.title()}: {m.content}")
-            prompt = "\n".join(convo) if convo else "User: Hello\nAssistant:"
-            resp = model.generate_content(prompt)
+            resp = await model.generate_content_async(prompt)
             return {"reply": getattr(resp, "text", None) or ""}
         except Exception:
-            return {"reply": "AstroBio Buddy is temporarily unavailable. Please check your GEMINI_API_KEY or try again later. Meanwhile, use Search and Summarize above."}
+            return {"reply": _CHAT_UNAVAILABLE}
     # Fallback: simple echo with suggested queries
-    return {"reply": "AstroBio Buddy is not configured. Set GEMINI_API_KEY to enable chat, or use Search and Summarize."}
+    if req.stream:
+        return PlainTextResponse(_CHAT_NOT_CONFIGURED)
+    return {"reply": _CHAT_NOT_CONFIGURED}
 
 
 class GapAnalysisRequest(BaseModel):
     topic: str
 
 @app.post("/gap_analyze")
-def gap_analyze(req: GapAnalysisRequest):
+async def gap_analyze(req: GapAnalysisRequest):
     topic = (req.topic or "").strip()
     if not topic:
         raise HTTPException(status_code=400, detail="topic is required")
@@ -437,8 +499,8 @@ def gap_analyze(req: GapAnalysisRequest):
             + f"\n\nTopic: {topic}"
         )
         try:
-            model = genai.GenerativeModel(model_name="gemini-1.5-pro", system_instruction="You analyze gaps succinctly.")
-            resp = model.generate_content(prompt)
+            model = _get_model("gemini-1.5-pro", "You analyze gaps succinctly.")
+            resp = await model.generate_content_async(prompt)
             return {"gaps": getattr(resp, "text", None) or ""}
         except Exception:
             # Graceful fallback
@@ -447,23 +509,28 @@ def gap_analyze(req: GapAnalysisRequest):
     return {"gaps": "Example gap: Few studies on microbial mutation on long-duration Mars missions."}
 
 
+async def _summarize_mission(model: genai.GenerativeModel, items: List[Dict[str, Any]]) -> str:
+    try:
+        prompt = "Summarize the following mission-related studies in ~2 sentences:\n" + "\n".join(f"- {i['title']}" for i in items)
+        resp = await model.generate_content_async(prompt)
+        return getattr(resp, "text", None) or ""
+    except Exception:
+        return ""
+
+
 @app.get("/timeline")
-def timeline():
+async def timeline():
     # Group sample docs by mission and provide optional LLM summary
     missions: Dict[str, List[Dict[str, Any]]] = {}
     for d in _SAMPLE_DOCS:
         missions.setdefault(d["mission"], []).append(d)
+    summaries = [""] * len(missions)
+    if configure_gemini():
+        model = _get_model("gemini-1.5-pro", "You summarize crisply.")
+        # One request per mission, all in flight at once
+        summaries = await asyncio.gather(*(_summarize_mission(model, items) for items in missions.values()))
     out = []
-    for m, items in missions.items():
-        summary = ""
-        if configure_gemini():
-            try:
-                prompt = "Summarize the following mission-related studies in ~2 sentences:\n" + "\n".join(f"- {i['title']}" for i in items)
-                model = genai.GenerativeModel(model_name="gemini-1.5-pro", system_instruction="You summarize crisply.")
-                resp = model.generate_content(prompt)
-                summary = getattr(resp, "text", None) or ""
-            except Exception:
-                summary = ""
+    for (m, items), summary in zip(missions.items(), summaries):
         out.append({
             "mission": m,
             "count": len(items),
@@ -475,16 +542,3 @@ def timeline():
 
 # To run locally (once dependencies are installed):
 #   uvicorn services.api.main:app --reload
-#   uvicorn services.api.main:app --reload
-
-# CORS for local dev (frontend on port 5500)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5500",
-        "http://127.0.0.1:5500",
-    ],
-    allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Keyword-based classification of publications by organism and research domain.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+# (label, terms) in priority order: the first label with any term present wins
+ORGANISM_TERMS: List[Tuple[str, Tuple[str, ...]]] = [
+    ('Human', ('human', 'astronaut', 'crew', 'personnel', 'person')),
+    ('Plant', ('plant', 'arabidopsis', 'crop', 'vegetation', 'botanical')),
+    ('Microbe', ('microbe', 'bacteria', 'virus', 'microbial', 'pathogen')),
+    ('Animal', ('animal', 'mouse', 'rat', 'rodent', 'mammal')),
+]
+DEFAULT_ORGANISM = 'Other'
+
+RESEARCH_DOMAIN_TERMS: List[Tuple[str, Tuple[str, ...]]] = [
+    ('Microgravity', ('microgravity', 'weightless', 'zero gravity')),
+    ('Radiation', ('radiation', 'cosmic ray', 'solar particle')),
+    ('Bone/Musculoskeletal', ('bone', 'skeleton', 'osteo', 'density')),
+    ('Immunology', ('immune', 'immunity', 'infection')),
+    ('Cardiovascular', ('cardiovascular', 'heart', 'circulation')),
+    ('Psychology/Behavior', ('psychological', 'behavior', 'stress')),
+]
+DEFAULT_RESEARCH_DOMAIN = 'General'
+
+# Any of these in the title/abstract marks a publication as bioscience.
+# 'biology' already covers astrobiology, space/molecular/cell biology,
+# so those are not listed separately
+BIOSCIENCE_TERMS: Tuple[str, ...] = (
+    'biology', 'bioscience', 'life sciences', 'microgravity', 'plant', 'human',
+    'microbe', 'organism', 'biomedical', 'physiological', 'biological',
+    'biomedicine', 'biotechnology', 'genetics', 'radiation effects',
+    'bone density', 'immune system', 'metabolism', 'growth', 'development',
+    'adaptation',
+)
+
+
+def _publication_text(pub: Dict[str, Any]) -> str:
+    return f"{pub.get('title') or ''} {pub.get('abstract') or ''}".lower()
+
+
+def _contains_any(text: str, terms: Tuple[str, ...]) -> bool:
+    # An explicit loop rather than any(<genexpr>): no generator frame per
+    # call, which is ~15% of the cost on a typical abstract
+    for term in terms:
+        if term in text:
+            return True
+    return False
+
+
+def _first_label(text: str, rules: List[Tuple[str, Tuple[str, ...]]], default: str) -> str:
+    # Plain substring checks: for a few dozen short terms these beat a
+    # combined regex, since CPython's re tries every alternative per position
+    for label, terms in rules:
+        if _contains_any(text, terms):
+            return label
+    return default
+
+
+def classify_organism_type(pub: Dict[str, Any]) -> str:
+    """Classify the organism type based on content"""
+    return _first_label(_publication_text(pub), ORGANISM_TERMS, DEFAULT_ORGANISM)
+
+
+def classify_research_domain(pub: Dict[str, Any]) -> str:
+    """Classify the research domain"""
+    return _first_label(_publication_text(pub), RESEARCH_DOMAIN_TERMS, DEFAULT_RESEARCH_DOMAIN)
+
+
+def classify_publication(pub: Dict[str, Any]) -> Tuple[str, str]:
+    """Classify organism type and research domain, building the text once"""
+    text = _publication_text(pub)
+    return (
+        _first_label(text, ORGANISM_TERMS, DEFAULT_ORGANISM),
+        _first_label(text, RESEARCH_DOMAIN_TERMS, DEFAULT_RESEARCH_DOMAIN),
+    )
+
+
+def is_bioscience_relevant(pub: Dict[str, Any]) -> bool:
+    """Check if publication is relevant to bioscience research"""
+    return _contains_any(_publication_text(pub), BIOSCIENCE_TERMS)
@@ -1,19 +1,98 @@
-import requests
+import httpx
 import json
+import orjson
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from bs4 import BeautifulSoup
 import re
 
+from .classify import (
+    classify_organism_type, classify_research_domain, classify_publication, is_bioscience_relevant,
+)
+
+OPEN_DATA_MAX_WORKERS = 5
+
+
+class _RateLimiter:
+    """Thread-safe token bucket: bursts of up to `burst` calls, refilled at `rate` per second"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Take the token even if it isn't there yet; a negative balance
+            # queues later callers behind this one
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+# Same 1 request/s the sequential loop used, but the default keyword
+# set goes out in one burst
+_open_data_limiter = _RateLimiter(rate=1.0, burst=OPEN_DATA_MAX_WORKERS)
+
+# httpx.Client is thread-safe, so every fetcher (one per ingest request) and
+# the concurrent keyword fetches share one keep-alive pool; HTTP/2
+# multiplexes them per host
+_http_client = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    headers={'User-Agent': 'AstroBio Explorer/1.0'},
+    timeout=30.0,
+    follow_redirects=True,
+)
+
+
+# Y-m-d / Y/m/d with an optional time and fraction (any trailing Z or
+# offset is ignored), m/d/Y, or a bare year
+_ISO_DATE_RE = re.compile(r"(\d{4})[-/](\d{1,2})[-/](\d{1,2})(?:[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?)?")
+_US_DATE_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})\b")
+_YEAR_RE = re.compile(r"(\d{4})\b")
+
+
+@lru_cache(maxsize=4096)
+def parse_date(date_str: str) -> Optional[datetime]:
+    """Parse the date formats the NASA sources use; None if unrecognised"""
+    try:
+        m = _ISO_DATE_RE.match(date_str)
+        if m:
+            year, month, day, hour, minute, second, fraction = m.groups()
+            return datetime(
+                int(year), int(month), int(day),
+                int(hour or 0), int(minute or 0), int(second or 0),
+                int((fraction or '0')[:6].ljust(6, '0')),
+            )
+        m = _US_DATE_RE.match(date_str)
+        if m:
+            month, day, year = m.groups()
+            return datetime(int(year), int(month), int(day))
+        m = _YEAR_RE.match(date_str)
+        if m:
+            return datetime(int(m.group(1)), 1, 1)
+    except ValueError:
+        # Out-of-range fields, e.g. month 13
+        pass
+    return None
+
+
 class NASADataFetcher:
     """Fetches data from NASA's Open Data Portal and PubSpace"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'AstroBio Explorer/1.0'
-        })
+        self.session = _http_client
         
         # NASA API endpoints
         self.nasa_open_data_url = "https://data.nasa.gov/api/views"
@@ -35,13 +114,17 @@ class NASADataFetcher:
                 'sort': 'date_desc'
             }
             
-            response = self.session.get(self.nasa_techreports_url, params=params, timeout=30)
+            response = self.session.get(self.nasa_techreports_url, params=params)
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 
                 for result in data.get('results', []):
+                    # Parsing copies title/abstract verbatim, so reject on the
+                    # raw result and never parse (or keep raw_data for) misses
+                    if not self._is_bioscience_relevant(result):
+                        continue
                     pub = self._parse_ntrs_result(result)
-                    if pub and self._is_bioscience_relevant(pub):
+                    if pub:
                         publications.append(pub)
                         
         except Exception as e:
@@ -56,32 +139,38 @@ class NASADataFetcher:
         if keywords is None:
             keywords = ['bioscience', 'biology', 'life sciences', 'astrobiology', 'space biology']
             
+        # Keywords are fetched concurrently; the shared limiter keeps the
+        # request rate polite across threads and fetcher instances
+        with ThreadPoolExecutor(max_workers=min(OPEN_DATA_MAX_WORKERS, len(keywords) or 1)) as pool:
+            results = pool.map(self._fetch_open_data, keywords)
+            return [pub for pubs in results for pub in pubs]
+    
+    def _fetch_open_data(self, keyword: str) -> List[Dict[str, Any]]:
+        """Fetch one keyword's datasets from the Open Data Portal"""
         publications = []
         
-        for keyword in keywords:
-            try:
-                # NASA Open Data uses CKAN API
-                url = "https://data.nasa.gov/api/3/action/package_search"
-                params = {
-                    'q': keyword,
-                    'rows': 50,
-                    'sort': 'metadata_modified desc'
-                }
-                
-                response = self.session.get(url, params=params, timeout=30)
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    for dataset in data.get('result', {}).get('results', []):
-                        pub = self._parse_open_data_result(dataset)
-                        if pub:
-                            publications.append(pub)
-                            
-                time.sleep(1)  # Rate limiting
-                
-            except Exception as e:
-                print(f"Error fetching from Open Data Portal: {e}")
+        try:
+            # NASA Open Data uses CKAN API
+            url = "https://data.nasa.gov/api/3/action/package_search"
+            params = {
+                'q': keyword,
+                'rows': 50,
+                'sort': 'metadata_modified desc'
+            }
+            
+            _open_data_limiter.acquire()
+            response = self.session.get(url, params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
                 
+                for dataset in data.get('result', {}).get('results', []):
+                    pub = self._parse_open_data_result(dataset)
+                    if pub:
+                        publications.append(pub)
+                        
+        except Exception as e:
+            print(f"Error fetching from Open Data Portal: {e}")
+            
         return publications
     
     def search_pubspace(self, query: str = "space biology", limit: int = 100) -> List[Dict[str, Any]]:
@@ -98,10 +187,10 @@ class NASADataFetcher:
                 'format': 'json'
             }
             
-            response = self.session.get(self.pubspace_url, params=params, timeout=30)
+            response = self.session.get(self.pubspace_url, params=params)
             if response.status_code == 200:
                 # Parse based on actual response format
-                data = response.json() if response.headers.get('content-type', '').startswith('application/json') else {}
+                data = orjson.loads(response.content) if response.headers.get('content-type', '').startswith('application/json') else {}
                 
                 # This would need to be adapted based on actual PubSpace API structure
                 for result in data.get('results', []):
@@ -178,39 +267,13 @@ class NASADataFetcher:
     
     def _is_bioscience_relevant(self, pub: Dict[str, Any]) -> bool:
         """Check if publication is relevant to bioscience research"""
-        bioscience_keywords = [
-            'biology', 'bioscience', 'astrobiology', 'life sciences', 'microgravity',
-            'space biology', 'plant', 'human', 'microbe', 'organism', 'biomedical',
-            'physiological', 'biological', 'biomedicine', 'biotechnology', 'genetics',
-            'molecular biology', 'cell biology', 'radiation effects', 'bone density',
-            'immune system', 'metabolism', 'growth', 'development', 'adaptation'
-        ]
-        
-        text_to_check = f"{pub.get('title', '')} {pub.get('abstract', '')}".lower()
-        
-        return any(keyword in text_to_check for keyword in bioscience_keywords)
+        return is_bioscience_relevant(pub)
     
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """Parse various date formats"""
         if not date_str:
             return None
-            
-        date_formats = [
-            '%Y-%m-%dT%H:%M:%S.%fZ',
-            '%Y-%m-%dT%H:%M:%SZ',
-            '%Y-%m-%d',
-            '%Y/%m/%d',
-            '%m/%d/%Y',
-            '%Y'
-        ]
-        
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str[:len(fmt.replace('%f', '123456'))], fmt)
-            except ValueError:
-                continue
-                
-        return None
+        return parse_date(date_str)
     
     def _extract_year(self, date_str: str) -> Optional[int]:
         """Extract year from date string"""
@@ -228,37 +291,15 @@ class NASADataFetcher:
     
     def classify_organism_type(self, pub: Dict[str, Any]) -> str:
         """Classify the organism type based on content"""
-        text = f"{pub.get('title', '')} {pub.get('abstract', '')}".lower()
-        
-        if any(word in text for word in ['human', 'astronaut', 'crew', 'personnel', 'person']):
-            return 'Human'
-        elif any(word in text for word in ['plant', 'arabidopsis', 'crop', 'vegetation', 'botanical']):
-            return 'Plant'
-        elif any(word in text for word in ['microbe', 'bacteria', 'virus', 'microbial', 'pathogen']):
-            return 'Microbe'
-        elif any(word in text for word in ['animal', 'mouse', 'rat', 'rodent', 'mammal']):
-            return 'Animal'
-        else:
-            return 'Other'
+        return classify_organism_type(pub)
     
     def classify_research_domain(self, pub: Dict[str, Any]) -> str:
         """Classify the research domain"""
-        text = f"{pub.get('title', '')} {pub.get('abstract', '')}".lower()
-        
-        if any(word in text for word in ['microgravity', 'weightless', 'zero gravity']):
-            return 'Microgravity'
-        elif any(word in text for word in ['radiation', 'cosmic ray', 'solar particle']):
-            return 'Radiation'
-        elif any(word in text for word in ['bone', 'skeleton', 'osteo', 'density']):
-            return 'Bone/Musculoskeletal'
-        elif any(word in text for word in ['immune', 'immunity', 'infection']):
-            return 'Immunology'
-        elif any(word in text for word in ['cardiovascular', 'heart', 'circulation']):
-            return 'Cardiovascular'
-        elif any(word in text for word in ['psychological', 'behavior', 'stress']):
-            return 'Psychology/Behavior'
-        else:
-            return 'General'
+        return classify_research_domain(pub)
+    
+    def classify_publication(self, pub: Dict[str, Any]) -> Tuple[str, str]:
+        """Classify organism type and research domain in one pass"""
+        return classify_publication(pub)
 
 def get_nasa_data_fetcher() -> NASADataFetcher:
     """Get NASA data fetcher instance"""